@@ -10,19 +10,45 @@
 #   • interface-specific helpers (L1/L2 line builders)
 
 import hashlib
+import os
 import re
+import tempfile
 from datetime import datetime
 from pathlib import Path
 
 from ansible.module_utils._text import to_text
+from ansible.module_utils.connection import Connection
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import (
     to_list,
 )
 
-
 # Backup helper
-def _sha1(text: str) -> str:
-    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+_CHUNK_SIZE = 64 * 1024
+
+
+def _file_digest(path: Path) -> bytes:
+    """Hash an existing backup in fixed-size chunks (no full read into memory)."""
+    digest = hashlib.blake2b()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _atomic_write(dst: Path, data: bytes) -> None:
+    """Write to a temp file next to *dst* and rename it into place."""
+    fd, tmp = tempfile.mkstemp(dir=dst.parent, prefix=f".{dst.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        if dst.is_file():
+            os.chmod(tmp, dst.stat().st_mode & 0o7777)
+        os.replace(tmp, dst)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
 
 
 def _last_backup(dir_: Path, prefix: str) -> Path | None:
@@ -45,18 +71,36 @@ def backup_config(
     Retrieves the running config and saves it locally.
     Returns (changed, path).
     """
+    if not do_backup:
+        return False, None
+    return backup_config_from_running(
+        load_running_config(conn), do_backup, user_path, prefix
+    )
+
+
+def backup_config_from_running(
+    running: list[str],
+    do_backup: bool,
+    user_path: str | None = None,
+    prefix: str = "vrp_",
+) -> tuple[bool, str | None]:
+    """
+    Saves an already loaded running config (list of lines) locally.
+    Returns (changed, path).
+    """
     if not do_backup:
         return False, None
 
-    cfg_text = "\n".join(load_running_config(conn))
+    cfg_bytes = "\n".join(running).encode("utf-8")
+    cfg_digest = hashlib.blake2b(cfg_bytes).digest()
 
     # A) User-defined path
     if user_path:
         dst = Path(user_path)
         dst.parent.mkdir(parents=True, exist_ok=True)
-        identical = dst.is_file() and dst.read_text() == cfg_text
+        identical = dst.is_file() and _file_digest(dst) == cfg_digest
         if not identical:
-            dst.write_text(cfg_text)
+            _atomic_write(dst, cfg_bytes)
         return (not identical), str(dst)
 
     # B) Automatic path in the ./backups directory
@@ -64,29 +108,121 @@ def backup_config(
     bdir.mkdir(exist_ok=True)
 
     last = _last_backup(bdir, prefix)
-    if last and _sha1(last.read_text()) == _sha1(cfg_text):
+    if last and _file_digest(last) == cfg_digest:
         return False, str(last)
 
     ts = datetime.now().strftime("%Y%m%d-%H%M%S")
     new_path = bdir / f"{prefix}{ts}.cfg"
-    new_path.write_text(cfg_text)
+    _atomic_write(new_path, cfg_bytes)
     return True, str(new_path)
 
 
 # helper (save)
+_SYSTEM_VIEW, _RETURN = "system-view", "return"
+# shared, read-only – appended as-is to every batch that needs a save
+_SAVE_CMD = {"command": "save", "prompt": "[Y/N]", "answer": "Y"}
+
+
 def append_save(cli_cmds: list, save_when: str, changed: bool) -> list:
     """Append a 'save' command depending on *save_when*."""
     if save_when == "always" or (save_when == "changed" and changed):
-        cli_cmds += [{"command": "save", "prompt": "[Y/N]", "answer": "Y"}]
+        cli_cmds.append(_SAVE_CMD)
     return cli_cmds
 
 
+def wrap_commands(parents, body_cmds, save_when: str) -> list:
+    """
+    Build the complete CLI batch for *body_cmds*:
+    system-view -> parents -> body -> return -> optional save.
+    The result is meant to be sent with a single run_commands() call.
+    """
+    return wrap_sections([(parents, body_cmds)], save_when)
+
+
+def wrap_sections(sections, save_when: str) -> list:
+    """
+    Like wrap_commands() for several (parents, body) *sections* in one
+    system-view session; 'quit' leaves each parent view before the next
+    section. Sections with an empty body are skipped.
+    """
+    sections = [(parents, body) for parents, body in sections if body]
+    if not sections:
+        return []
+
+    cli = [_SYSTEM_VIEW]
+    for parents, body in sections[:-1]:
+        cli += [*parents, *body, *["quit"] * len(parents)]
+    parents, body = sections[-1]
+    # one 'return' reaches user view from any depth; a second one is redundant
+    cli += [*parents, *body, _RETURN]
+    return append_save(cli, save_when, changed=True)
+
+
 # Generic helpers (running‑config access, parent utils)
-def load_running_config(conn):
-    raw = conn.run_commands("display current-configuration")[0]
+def parse_running_config(raw):
     return to_text(raw, errors="surrogate_or_strict").splitlines()
 
 
+def load_running_config(conn):
+    return parse_running_config(conn.run_commands("display current-configuration")[0])
+
+
+def connect_and_load(module):
+    """
+    Return (conn, running) for modules offering a *running_config* option.
+    A supplied running_config replaces the device fetch unless a backup is
+    requested; in check mode no connection is opened then (conn is None).
+    """
+    p = module.params
+    if p.get("running_config") is None or p.get("backup"):
+        conn = Connection(module._socket_path)
+        return conn, load_running_config(conn)
+
+    conn = None if module.check_mode else Connection(module._socket_path)
+    return conn, parse_running_config(p["running_config"])
+
+
+def load_and_backup(module, desired_lines, prefix):
+    """
+    connect_and_load() plus the optional backup for the global line modules;
+    returns (conn, running, backup_changed, backup_path). Exits the module
+    when *desired_lines* is empty: without any device access if no backup
+    is requested, otherwise right after writing the backup.
+    """
+    p = module.params
+    if not desired_lines and not p["backup"]:
+        module.exit_json(changed=False, commands=[], responses=[], backup_path=None)
+
+    conn, running = connect_and_load(module)
+    backup_changed, backup_path = backup_config_from_running(
+        running, p["backup"], p.get("backup_path"), prefix=prefix
+    )
+
+    # backup only -> nothing to diff
+    if not desired_lines:
+        module.exit_json(
+            changed=backup_changed,
+            commands=[],
+            responses=[],
+            backup_path=backup_path,
+        )
+    return conn, running, backup_changed, backup_path
+
+
+def expand_aggregate(p) -> list[dict]:
+    """
+    Expand the *aggregate* option into one params dict per item; keys an
+    item leaves unset (None) fall back to the top-level value. An empty
+    list (e.g. from an empty templated variable) yields no items at all.
+    """
+    if p.get("aggregate") is None:
+        return [p]
+    return [
+        {**p, **{k: v for k, v in item.items() if v is not None}}
+        for item in p["aggregate"]
+    ]
+
+
 def to_parents(obj):
     return [obj] if isinstance(obj, str) else to_list(obj)
 
@@ -175,6 +311,10 @@ def _undo_cmd(line: str) -> str:
     if tokens[0] == "local-user" and len(tokens) >= 2:
         return f"undo local-user {tokens[1]}"
 
+    # VLAN root line
+    if tokens[0] == "vlan" and len(tokens) == 2:
+        return f"undo vlan {tokens[1]}"
+
     # STP interface features
     if tokens[:3] == ["stp", "edged-port", "enable"]:
         return "undo stp edged-port"
@@ -190,16 +330,18 @@ def _undo_cmd(line: str) -> str:
 # Diff engine  ──  string normalisation & compare
 _dash_map = {ord("–"): " ", ord("—"): " "}
 _defrag = re.compile(r"\s+")
+_dash_ws = re.compile(r"\s*-\s*")
+_tz_offset = re.compile(r"add 0*([0-9]+):00:00")
 
 
 def _norm(s: str) -> str:
     s = s.strip().translate(_dash_map)
     s = s.replace(" to ", "-")
-    s = re.sub(r"\s*-\s*", "-", s)
+    s = _dash_ws.sub("-", s)
     s = _defrag.sub(" ", s)
     low = s.lower()
 
-    low = re.sub(r"add 0*([0-9]+):00:00", r"add \1", low)
+    low = _tz_offset.sub(r"add \1", low)
 
     if low.startswith("port trunk allow-pass vlan "):
         prefix, vlans = low.split("vlan ", 1)
@@ -217,6 +359,14 @@ def _norm(s: str) -> str:
     return low
 
 
+def _other_link_type(raw_by_norm) -> bool:
+    """True if the block sets a port link-type other than access."""
+    return any(
+        raw.startswith("port link-type ") and norm != "port link-type access"
+        for norm, raw in raw_by_norm.items()
+    )
+
+
 def diff_line_match(running, parents, cand_children, state, keep):
     cmds: list[str] = []
 
@@ -226,6 +376,9 @@ def diff_line_match(running, parents, cand_children, state, keep):
     raw_by_norm = {_norm(c): c.lstrip() for c in blk_children}
     stripped = set(raw_by_norm)
 
+    # link-type other than access configured? scanned on first need only
+    other_link_type = None
+
     # state == replace
     if state == "replace":
         desired = {_norm(c) for c in cand_children}
@@ -237,10 +390,9 @@ def diff_line_match(running, parents, cand_children, state, keep):
         for raw in cand_children:
             plain = _norm(raw)
             if plain == "port link-type access":
-                if any(
-                    line.startswith("port link-type ") and _norm(line) != plain
-                    for line in raw_by_norm.values()
-                ):
+                if other_link_type is None:
+                    other_link_type = _other_link_type(raw_by_norm)
+                if other_link_type:
                     cmds.append(raw)
                 continue
             if plain == "undo shutdown":
@@ -267,10 +419,9 @@ def diff_line_match(running, parents, cand_children, state, keep):
                     cmds.append(raw)
                 continue
             if plain == "port link-type access":
-                if any(
-                    line.startswith("port link-type ") and _norm(line) != plain
-                    for line in raw_by_norm.values()
-                ):
+                if other_link_type is None:
+                    other_link_type = _other_link_type(raw_by_norm)
+                if other_link_type:
                     cmds.append(raw)
                 continue
             if plain not in stripped:
@@ -283,6 +434,23 @@ def diff_line_match(running, parents, cand_children, state, keep):
     return cmds
 
 
+def diff_sections(running, sections, state: str, keep=None, wrap_user=None):
+    """
+    Diff several (parents, candidate children) *sections* against one
+    *running* config; returns the (parents, changed body) pairs for
+    wrap_sections(). *wrap_user* adds the user-specific confirmation
+    prompts (wrap_cmd) to the changed lines.
+    """
+    keep = keep or []
+    out = []
+    for parents, cand_children in sections:
+        body = diff_line_match(running, parents, cand_children, state, keep)
+        if wrap_user:
+            body = [wrap_cmd(c, user=wrap_user) for c in body]
+        out.append((parents, body))
+    return out
+
+
 def diff_and_wrap(
     conn,
     parents,
@@ -292,20 +460,20 @@ def diff_and_wrap(
     replace=True,
     keep=None,
     state: str | None = None,
+    running: list[str] | None = None,
 ):
-    """Diff -> wrap with *system-view/return/save* boilerplate."""
-    keep = keep or []
+    """
+    Diff -> wrap with *system-view/return/save* boilerplate.
+    Pass *running* to diff against an already loaded running config.
+    """
     desired_state = state or ("replace" if replace else "present")
+    if running is None:
+        running = load_running_config(conn)
 
-    body_changed = diff_line_match(
-        load_running_config(conn), parents, cand_children, desired_state, keep
-    )
-    if not body_changed:
-        return False, []
-
-    cli = ["system-view", *parents, *body_changed, *["return"] * (len(parents) + 1)]
-    append_save(cli, save_when, changed=True)
-    return True, cli
+    # the single-section case of diff_sections() -> wrap_sections()
+    sections = diff_sections(running, [(parents, cand_children)], desired_state, keep)
+    cli = wrap_sections(sections, save_when)
+    return bool(cli), cli
 
 
 # Interface helpers (lines builder)
@@ -379,8 +547,16 @@ def build_interface_lines(p):
 
 #  Convenience helper
 def lines_present(running: list[str], desired: list[str]) -> bool:
-    flat = {line.strip() for line in running}
-    return all(line.strip() in flat for line in desired)
+    """True if every *desired* line exists in *running* (one hash lookup each)."""
+    flat = frozenset(line.strip() for line in running)
+    return flat.issuperset(line.strip() for line in desired)
+
+
+# Confirmation prompt (Y/N, y/n, Y N ...).  Kept as a string: the command
+# dicts are sent as JSON to ansible-connection, which compiles it there.
+_PROMPT_YN = r"[Yy][/ ]?[Nn]"
+# command substrings that always trigger a Y/N confirmation
+_CONFIRM_KEYS = ("save", "continue", "overwrite")
 
 
 def wrap_cmd(cmd, user=None, priv_cmd=None):
@@ -388,31 +564,22 @@ def wrap_cmd(cmd, user=None, priv_cmd=None):
     if isinstance(cmd, dict):
         return cmd
 
-    yn = r"[Yy][/ ]?[Nn]"
-    confirm = {
-        "save": yn,
-        "continue": yn,
-        "overwrite": yn,
-    }
-
+    keys = _CONFIRM_KEYS
     if user:
-        confirm.update(
-            {
-                f"rsa peer-public-key {user}": yn,
-                f"ssh user {user} authentication-type rsa": yn,
-                f"ssh user {user} assign rsa-key {user}": yn,
-                f"local-user {user} password irreversible-cipher": yn,
-                f"local-user {user}": yn,
-                "assign rsa-key": yn,
-            }
+        keys += (
+            f"rsa peer-public-key {user}",
+            f"ssh user {user} authentication-type rsa",
+            f"ssh user {user} assign rsa-key {user}",
+            f"local-user {user} password irreversible-cipher",
+            f"local-user {user}",
+            "assign rsa-key",
         )
 
     if priv_cmd:
-        confirm[priv_cmd] = yn
+        keys += (priv_cmd,)
 
-    for key, regex in confirm.items():
-        if key in cmd:
-            return {"command": cmd, "prompt": regex, "answer": "Y"}
+    if any(key in cmd for key in keys):
+        return {"command": cmd, "prompt": _PROMPT_YN, "answer": "Y"}
     return cmd
 
 
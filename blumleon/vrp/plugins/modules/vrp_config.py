@@ -163,8 +163,8 @@ def main() -> None:
     )
     changed_config = bool(body_cmds)
 
-    backup_changed, backup_path = vc.backup_config(
-        conn,
+    backup_changed, backup_path = vc.backup_config_from_running(
+        running,
         do_backup=p["backup"],
         user_path=p.get("backup_path"),
         prefix="vrp_config_",
@@ -180,10 +180,7 @@ def main() -> None:
     # Live-Run
     cli_cmds, responses = [], []
     if changed_config:
-        cli_cmds = (
-            ["system-view"] + parents + body_cmds + ["return"] * (len(parents) + 1)
-        )
-        vc.append_save(cli_cmds, p["save_when"], changed=True)
+        cli_cmds = vc.wrap_commands(parents, body_cmds, p["save_when"])
         responses = conn.run_commands(cli_cmds)
 
     module.exit_json(
@@ -142,7 +142,6 @@ commands:
     - port default vlan 3999
     - undo shutdown
     - return
-    - return
     - command: save
       prompt: '[Y/N]'
       answer: 'Y'
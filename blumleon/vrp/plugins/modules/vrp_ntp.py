@@ -106,6 +106,16 @@ options:
       - Optional path on the controller to store the backup file.
     type: str
 
+  running_config:
+    description:
+      - Running configuration of the device as text, e.g. the registered output of
+        C(display current-configuration) from M(blumleon.vrp.vrp_command).
+      - When set, the module compares against this text instead of fetching the
+        running configuration from the device.
+      - In check mode no connection to the device is opened at all.
+      - Ignored when C(backup=true); the backup is always taken from the device.
+    type: str
+
 notes:
   - Requires C(ansible_connection=ansible.netcommon.network_cli).
   - The module applies all configuration commands globally.
@@ -133,6 +143,17 @@ EXAMPLES = r"""
     dst_end:   "01:00 2026-10-25"
     dst_offset: "01:00"
     save_when: changed
+
+- name: Read the running config once
+  blumleon.vrp.vrp_command:
+    commands: display current-configuration
+  register: running
+
+- name: Preview NTP changes offline against the registered config
+  blumleon.vrp.vrp_ntp:
+    server: 192.0.2.10
+    running_config: "{{ running.stdout[0] }}"
+  check_mode: true
 """
 
 RETURN = r"""
@@ -160,17 +181,14 @@ backup_path:
 """
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.connection import Connection
 from ansible_collections.blumleon.vrp.plugins.module_utils import vrp_common as vc
 
 
-def _build_desired_lines(p: dict) -> list[str]:
-    """Return a list of CLI lines that should be present or absent."""
-    lines: list[str] = []
-
+def _iter_desired_lines(p: dict):
+    """Yield the CLI lines that should be present or absent."""
     # Manage timezone/DST only when explicitly requested
     if p["manage_timezone"]:
-        lines.append(f"clock timezone {p['timezone_name']} add {p['timezone_offset']}")
+        yield f"clock timezone {p['timezone_name']} add {p['timezone_offset']}"
 
         # Add daylight-saving configuration only if both dates are provided
         if (
@@ -179,65 +197,68 @@ def _build_desired_lines(p: dict) -> list[str]:
             and p.get("dst_name")
             and p.get("dst_offset")
         ):
-            lines.append(
+            yield (
                 f"clock daylight-saving-time {p['dst_name']} one-year "
                 f"{p['dst_start']} {p['dst_end']} {p['dst_offset']}"
             )
 
     # NTP server is always considered
-    lines.append(f"ntp unicast-server {p['server']}")
+    yield f"ntp unicast-server {p['server']}"
 
     if p["disable_ipv4_server"]:
-        lines.append("ntp server disable")
+        yield "ntp server disable"
     if p["disable_ipv6_server"]:
-        lines.append("ntp ipv6 server disable")
+        yield "ntp ipv6 server disable"
     if p.get("source_interface"):
-        lines.append(f"ntp server source-interface {p['source_interface']}")
+        yield f"ntp server source-interface {p['source_interface']}"
 
-    return lines
 
+def _build_desired_lines(p: dict) -> list[str]:
+    """Return the unique CLI lines that should be present or absent."""
+    return list(dict.fromkeys(_iter_desired_lines(p)))
+
+
+_ARG_SPEC = dict(
+    # required
+    server=dict(type="str", required=True),
+    # optional
+    source_interface=dict(type="str"),
+    timezone_name=dict(type="str", default="CET"),
+    timezone_offset=dict(type="int", default=1),
+    dst_name=dict(type="str"),
+    dst_start=dict(type="str"),
+    dst_end=dict(type="str"),
+    dst_offset=dict(type="str"),
+    disable_ipv4_server=dict(type="bool", default=True),
+    disable_ipv6_server=dict(type="bool", default=True),
+    manage_timezone=dict(type="bool"),
+    state=dict(type="str", choices=["present", "absent"], default="present"),
+    save_when=dict(
+        type="str", choices=["never", "changed", "always"], default="changed"
+    ),
+    backup=dict(type="bool", default=False),
+    backup_path=dict(type="str"),
+    running_config=dict(type="str"),
+)
 
-def main() -> None:
-    arg_spec = dict(
-        # required
-        server=dict(type="str", required=True),
-        # optional
-        source_interface=dict(type="str"),
-        timezone_name=dict(type="str", default="CET"),
-        timezone_offset=dict(type="int", default=1),
-        dst_name=dict(type="str"),
-        dst_start=dict(type="str"),
-        dst_end=dict(type="str"),
-        dst_offset=dict(type="str"),
-        disable_ipv4_server=dict(type="bool", default=True),
-        disable_ipv6_server=dict(type="bool", default=True),
-        manage_timezone=dict(type="bool"),
-        state=dict(type="str", choices=["present", "absent"], default="present"),
-        save_when=dict(
-            type="str", choices=["never", "changed", "always"], default="changed"
-        ),
-        backup=dict(type="bool", default=False),
-        backup_path=dict(type="str"),
-    )
 
-    module = AnsibleModule(argument_spec=arg_spec, supports_check_mode=True)
+def main() -> None:
+    module = AnsibleModule(argument_spec=_ARG_SPEC, supports_check_mode=True)
     p = module.params
 
     # Default behavior: manage timezone for present, skip for absent
     if p["manage_timezone"] is None:
         p["manage_timezone"] = p["state"] == "present"
 
-    conn = Connection(module._socket_path)
-
-    # optional backup
-    backup_changed, backup_path = vc.backup_config(
-        conn, p["backup"], p.get("backup_path"), prefix="vrp_ntp_"
-    )
-
     # desired configuration
     desired_lines = _build_desired_lines(p)
     desired_state = "absent" if p["state"] == "absent" else "present"
 
+    # running config fetched once for both backup and diff
+    conn, running, backup_changed, backup_path = vc.load_and_backup(
+        module, desired_lines, prefix="vrp_ntp_"
+    )
+
     # generate CLI commands
     cfg_changed, cli_cmds = vc.diff_and_wrap(
         conn,
@@ -247,6 +268,7 @@ def main() -> None:
         state=desired_state,
         replace=False,
         keep=[],
+        running=running,
     )
 
     changed = cfg_changed or backup_changed
@@ -48,6 +48,16 @@ options:
     type: str
     required: false
 
+  running_config:
+    description:
+      - Running configuration of the device as text, e.g. the registered output of
+        C(display current-configuration) from M(blumleon.vrp.vrp_command).
+      - When set, the module compares against this text instead of fetching the
+        running configuration from the device.
+      - In check mode no connection to the device is opened at all.
+      - Ignored when C(backup=true); the backup is always taken from the device.
+    type: str
+
 notes:
   - Requires C(ansible_connection=ansible.netcommon.network_cli).
   - Only affects global config.
@@ -93,7 +103,6 @@ backup_path:
 """
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.connection import Connection
 from ansible_collections.blumleon.vrp.plugins.module_utils import vrp_common as vc
 
 
@@ -105,30 +114,31 @@ def _build_desired_lines(p: dict) -> list[str]:
     return []
 
 
-def main() -> None:
-    arg_spec = dict(
-        bpdu_protect=dict(type="bool"),
-        state=dict(type="str", choices=["present", "absent"], default="present"),
-        save_when=dict(
-            type="str", choices=["never", "changed", "always"], default="changed"
-        ),
-        backup=dict(type="bool", default=False),
-        backup_path=dict(type="str"),
-    )
+_ARG_SPEC = dict(
+    bpdu_protect=dict(type="bool"),
+    state=dict(type="str", choices=["present", "absent"], default="present"),
+    save_when=dict(
+        type="str", choices=["never", "changed", "always"], default="changed"
+    ),
+    backup=dict(type="bool", default=False),
+    backup_path=dict(type="str"),
+    running_config=dict(type="str"),
+)
 
-    module = AnsibleModule(argument_spec=arg_spec, supports_check_mode=True)
-    p = module.params
-    conn = Connection(module._socket_path)
 
-    # optional backup
-    backup_changed, backup_path = vc.backup_config(
-        conn, p["backup"], p.get("backup_path"), prefix="vrp_stp_"
-    )
+def main() -> None:
+    module = AnsibleModule(argument_spec=_ARG_SPEC, supports_check_mode=True)
+    p = module.params
 
     # desired body
     desired_lines = _build_desired_lines(p)
     desired_state = "absent" if p["state"] == "absent" else "present"
 
+    # exits early (after an optional backup) if there is nothing to configure
+    conn, running, backup_changed, backup_path = vc.load_and_backup(
+        module, desired_lines, prefix="vrp_stp_"
+    )
+
     # diff & wrap
     cfg_changed, cli_cmds = vc.diff_and_wrap(
         conn,
@@ -138,6 +148,7 @@ def main() -> None:
         state=desired_state,
         replace=(desired_state == "absent"),
         keep=[],
+        running=running,
     )
 
     changed = cfg_changed or backup_changed
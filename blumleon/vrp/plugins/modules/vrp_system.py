@@ -60,6 +60,16 @@ options:
     type: str
     required: false
 
+  running_config:
+    description:
+      - Running configuration of the device as text, e.g. the registered output of
+        C(display current-configuration) from M(blumleon.vrp.vrp_command).
+      - When set, the module compares against this text instead of fetching the
+        running configuration from the device.
+      - In check mode no connection to the device is opened at all.
+      - Ignored when C(backup=true); the backup is always taken from the device.
+    type: str
+
 notes:
   - Requires C(ansible_connection=ansible.netcommon.network_cli).
   - Always affects global config.
@@ -111,7 +121,6 @@ backup_path:
 """
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.connection import Connection
 from ansible_collections.blumleon.vrp.plugins.module_utils import vrp_common as vc
 
 
@@ -122,41 +131,40 @@ def _build_desired_lines(p: dict) -> list[str]:
     if p.get("domain_name"):
         lines.append(f"ip domain-name {p['domain_name']}")
 
-    for ip in p.get("ipv4") or []:
-        lines.append(f"dns server {ip}")
+    lines += ["dns server " + ip for ip in p.get("ipv4") or ()]
+    lines += ["dns server ipv6 " + ip for ip in p.get("ipv6") or ()]
 
-    for ip in p.get("ipv6") or []:
-        lines.append(f"dns server ipv6 {ip}")
+    # drop duplicate servers, keep order
+    return list(dict.fromkeys(lines))
 
-    return lines
 
+_ARG_SPEC = dict(
+    domain_name=dict(type="str"),
+    ipv4=dict(type="list", elements="str"),
+    ipv6=dict(type="list", elements="str"),
+    state=dict(type="str", choices=["present", "absent"], default="present"),
+    save_when=dict(
+        type="str", choices=["never", "changed", "always"], default="changed"
+    ),
+    backup=dict(type="bool", default=False),
+    backup_path=dict(type="str"),
+    running_config=dict(type="str"),
+)
 
-def main() -> None:
-    arg_spec = dict(
-        domain_name=dict(type="str"),
-        ipv4=dict(type="list", elements="str"),
-        ipv6=dict(type="list", elements="str"),
-        state=dict(type="str", choices=["present", "absent"], default="present"),
-        save_when=dict(
-            type="str", choices=["never", "changed", "always"], default="changed"
-        ),
-        backup=dict(type="bool", default=False),
-        backup_path=dict(type="str"),
-    )
 
-    module = AnsibleModule(argument_spec=arg_spec, supports_check_mode=True)
+def main() -> None:
+    module = AnsibleModule(argument_spec=_ARG_SPEC, supports_check_mode=True)
     p = module.params
-    conn = Connection(module._socket_path)
-
-    # optional backup
-    backup_changed, backup_path = vc.backup_config(
-        conn, p["backup"], p.get("backup_path"), prefix="vrp_system_"
-    )
 
     # build desired body
     desired_lines = _build_desired_lines(p)
     desired_state = "absent" if p["state"] == "absent" else "present"
 
+    # exits early (after an optional backup) if there is nothing to configure
+    conn, running, backup_changed, backup_path = vc.load_and_backup(
+        module, desired_lines, prefix="vrp_system_"
+    )
+
     # diff & wrap
     cfg_changed, cli_cmds = vc.diff_and_wrap(
         conn,
@@ -166,6 +174,7 @@ def main() -> None:
         state=desired_state,
         replace=False,
         keep=[],
+        running=running,
     )
 
     changed = cfg_changed or backup_changed
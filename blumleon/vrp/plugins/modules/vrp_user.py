@@ -22,8 +22,37 @@ options:
   name:
     description:
       - Name of the user account.
+      - Required unless C(aggregate) is given; mutually exclusive with it.
     type: str
-    required: true
+
+  aggregate:
+    description:
+      - List of users to manage in a single device session.
+      - Options not set on an entry fall back to the top-level value.
+    type: list
+    elements: dict
+    suboptions:
+      name:
+        description: Name of the user account.
+        type: str
+        required: true
+      password:
+        description: User password (see top-level C(password)).
+        type: str
+      ssh_key:
+        description: Public key in OpenSSH format (see top-level C(ssh_key)).
+        type: str
+      level:
+        description: Privilege level of the user.
+        type: int
+      service_type:
+        description: Protocols the user is allowed to use.
+        type: str
+        choices: [ssh, telnet]
+      state:
+        description: Whether the user should be present or removed.
+        type: str
+        choices: [present, absent]
 
   password:
     description:
@@ -36,6 +65,7 @@ options:
     description:
       - Public key in OpenSSH format.
       - If specified, the user will be created without a password and authenticated via RSA.
+      - Only C(ssh-rsa) keys are supported; the key is validated before connecting to the device.
     type: str
     required: false
 
@@ -71,6 +101,7 @@ notes:
   - If C(ssh_key) is provided, the module will wrap the key automatically and inject it under C(rsa peer-public-key) with C(public-key-code).
   - Prompt confirmation for privilege or undo actions is automatically handled.
   - Password-based and SSH key-based users are mutually exclusive (password is ignored if key is present).
+  - With C(aggregate), the running configuration is read once and all users are configured in one batch with at most one save.
 
 seealso:
   - module: blumleon.vrp.vrp_config
@@ -94,6 +125,19 @@ EXAMPLES = r"""
     service_type: telnet
     save_when: changed
 
+- name: Create several users in one device session
+  blumleon.vrp.vrp_user:
+    aggregate:
+      - name: ops1
+        password: <changeme>
+      - name: ops2
+        password: <changeme>
+        level: 2
+      - name: legacy_admin
+        state: absent
+    level: 3
+    service_type: ssh
+
 - name: Remove a local user completely
   blumleon.vrp.vrp_user:
     name: ansible_user
@@ -120,7 +164,8 @@ responses:
   returned: when changed
 """
 
-import traceback
+import base64
+import binascii
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.connection import Connection
@@ -132,121 +177,157 @@ def _split_key_vrp(pub: str) -> list[str]:
     return [pub.strip()]
 
 
-def _aaa_one_liners(p):
+def _peer_key_cmds(p) -> list:
+    """Complete `rsa peer-public-key` import dialogue, in device order."""
     n = p["name"]
+    return [
+        vc.wrap_cmd(f"rsa peer-public-key {n} encoding-type openssh", user=n),
+        "public-key-code begin",
+        *_split_key_vrp(p["ssh_key"]),
+        "public-key-code end",
+        "peer-public-key end",
+    ]
+
+
+def _validate_openssh_key(key: str) -> str | None:
+    """Return why *key* is no importable OpenSSH ssh-rsa key, or None."""
+    parts = key.split()
+    if len(parts) < 2:
+        return "expected '<type> <base64-data> [comment]'"
+    typ, data = parts[:2]
+    # only RSA keys can be imported via 'rsa peer-public-key'
+    if typ != "ssh-rsa":
+        return f"unsupported key type '{typ}', only ssh-rsa is supported"
+    try:
+        blob = base64.b64decode(data, validate=True)
+    except (binascii.Error, ValueError):
+        return "key data is not valid base64"
+    # the blob starts with the length-prefixed key type again
+    tlen = int.from_bytes(blob[:4], "big")
+    if blob[4 : 4 + tlen] != typ.encode():
+        return "key data does not match the key type"
+    return None
+
+
+def _aaa_one_liners(p):
+    prefix = f"local-user {p['name']}"
+    pw, lvl, st = p.get("password"), p.get("level"), p.get("service_type")
     out: list[str] = []
-    if p.get("password"):
-        out.append(f"local-user {n} password irreversible-cipher {p['password']}")
-    if p.get("level") is not None:
-        out.append(f"local-user {n} privilege level {p['level']}")
-    if p.get("service_type"):
-        out.append(f"local-user {n} service-type {p['service_type']}")
+    if pw:
+        out.append(f"{prefix} password irreversible-cipher {pw}")
+    if lvl is not None:
+        out.append(f"{prefix} privilege level {lvl}")
+    if st:
+        out.append(f"{prefix} service-type {st}")
     return out
 
 
 def _ssh_user_block(p):
-    n = p["name"]
-    return [
+    prefix = f"ssh user {p['name']}"
+    return [f"{prefix} authentication-type rsa", f"{prefix} service-type stelnet"]
+
+
+def _user_configured(running: list[str], n: str) -> bool:
+    """True if any local-user, ssh user or peer-key line refers to *n*."""
+    prefixes = (f"local-user {n} ", f"ssh user {n} ", f"rsa peer-public-key {n} ")
+    return any(f"{line.strip()} ".startswith(prefixes) for line in running)
+
+
+def _user_sections(u, running: list[str]) -> list[tuple[list[str], list]]:
+    """(parents, body) sections that bring user *u* into its desired state."""
+    n = u["name"]
+
+    if u["state"] == "present" and u.get("ssh_key"):
+        # key import, ssh-user assignment and AAA lines in one system-view session
+        key_cmds = [
+            *_peer_key_cmds(u),
+            vc.wrap_cmd(f"ssh user {n} assign rsa-key {n}", user=n),
+        ]
+        return [([], key_cmds)] + vc.diff_sections(
+            running,
+            [(["aaa"], _aaa_one_liners(u)), ([], _ssh_user_block(u))],
+            "present",
+            wrap_user=n,
+        )
+
+    if u["state"] == "present":
+        return vc.diff_sections(
+            running, [(["aaa"], _aaa_one_liners(u))], "present", wrap_user=n
+        )
+
+    # nothing configured for this user -> no undo commands
+    if not _user_configured(running, n):
+        return []
+
+    lines_global = [
         f"ssh user {n} authentication-type rsa",
+        f"ssh user {n} assign rsa-key {n}",
         f"ssh user {n} service-type stelnet",
+        f"rsa peer-public-key {n} encoding-type openssh",
     ]
+    lines_aaa = [
+        f"local-user {n} password irreversible-cipher dummy",
+        f"local-user {n} privilege level 3",
+        f"local-user {n} service-type ssh",
+    ]
+    return vc.diff_sections(
+        running, [([], lines_global), (["aaa"], lines_aaa)], "absent", wrap_user=n
+    )
 
 
 def _safe_run(conn, final, module):
-    resp: list[str] = []
     try:
-        for cmd in final:
-            resp += conn.run_commands([cmd])
-        return resp
+        return conn.run_commands(final)
     except Exception:
+        import traceback  # only needed on this error path
+
         module.fail_json(msg="Command execution failed", debug=[traceback.format_exc()])
 
 
 def main() -> None:
-    spec = dict(
+    user_options = dict(
         name=dict(type="str", required=True),
         password=dict(type="str", no_log=True),
         ssh_key=dict(type="str", no_log=True),
         level=dict(type="int"),
         service_type=dict(type="str", choices=["ssh", "telnet"]),
+        state=dict(type="str", choices=["present", "absent"]),
+    )
+    spec = dict(
+        name=dict(type="str"),
+        aggregate=dict(type="list", elements="dict", options=user_options),
+        password=dict(type="str", no_log=True),
+        ssh_key=dict(type="str", no_log=True),
+        level=dict(type="int"),
+        service_type=dict(type="str", choices=["ssh", "telnet"]),
         state=dict(type="str", choices=["present", "absent"], default="present"),
         save_when=dict(
             type="str", choices=["never", "changed", "always"], default="changed"
         ),
     )
-    module = AnsibleModule(argument_spec=spec, supports_check_mode=True)
-    p, conn = module.params, Connection(module._socket_path)
-    n = p["name"]
-
-    cli: list = []
-    changed = False
-
-    if p["state"] == "present" and p.get("ssh_key"):
-        cli += [
-            "system-view",
-            vc.wrap_cmd(f"rsa peer-public-key {n} encoding-type openssh", user=n),
-            "public-key-code begin",
-            *_split_key_vrp(p["ssh_key"]),
-            "public-key-code end",
-            "peer-public-key end",
-            "return",
-            "system-view",
-            vc.wrap_cmd(f"ssh user {n} assign rsa-key {n}", user=n),
-            "return",
-            vc.wrap_cmd("save"),
-        ]
-        changed = True
-
-        c2, cli2 = vc.diff_and_wrap(
-            conn,
-            ["aaa"],
-            _aaa_one_liners(p),
-            p["save_when"],
-            replace=False,
-            state="present",
-        )
-        c3, cli3 = vc.diff_and_wrap(
-            conn, [], _ssh_user_block(p), p["save_when"], replace=False, state="present"
-        )
-        cli += [vc.wrap_cmd(cmd, user=n) for cmd in cli2]
-        cli += [vc.wrap_cmd(cmd, user=n) for cmd in cli3]
-        changed |= c2 or c3
-
-    elif p["state"] == "present":
-        c2, cli2 = vc.diff_and_wrap(
-            conn,
-            ["aaa"],
-            _aaa_one_liners(p),
-            p["save_when"],
-            replace=False,
-            state="present",
-        )
-        cli += [vc.wrap_cmd(cmd, user=n) for cmd in cli2]
-        changed |= c2
-
-    else:
-        lines_global = [
-            f"ssh user {n} authentication-type rsa",
-            f"ssh user {n} assign rsa-key {n}",
-            f"ssh user {n} service-type stelnet",
-            f"rsa peer-public-key {n} encoding-type openssh",
-        ]
-        lines_aaa = [
-            f"local-user {n} password irreversible-cipher dummy",
-            f"local-user {n} privilege level 3",
-            f"local-user {n} service-type ssh",
-        ]
-
-        c1, cli1 = vc.diff_and_wrap(
-            conn, [], lines_global, p["save_when"], replace=False, state="absent"
-        )
-        c2, cli2 = vc.diff_and_wrap(
-            conn, ["aaa"], lines_aaa, p["save_when"], replace=False, state="absent"
-        )
-
-        cli += [vc.wrap_cmd(cmd, user=n) for cmd in cli1]
-        cli += [vc.wrap_cmd(cmd, user=n) for cmd in cli2]
-        changed |= c1 or c2
+    module = AnsibleModule(
+        argument_spec=spec,
+        mutually_exclusive=[("aggregate", "name")],
+        required_one_of=[("aggregate", "name")],
+        supports_check_mode=True,
+    )
+    p = module.params
+    users = vc.expand_aggregate(p)
+
+    # reject malformed keys before any device round-trip
+    for u in users:
+        if u["state"] == "present" and u.get("ssh_key"):
+            err = _validate_openssh_key(u["ssh_key"])
+            if err:
+                module.fail_json(msg=f"invalid ssh_key for user {u['name']}: {err}")
+
+    conn = Connection(module._socket_path)
+    # one running-config fetch shared by all users and diffs below
+    running = vc.load_running_config(conn)
+
+    sections = [s for u in users for s in _user_sections(u, running)]
+    cli = vc.wrap_sections(sections, p["save_when"])
+    changed = bool(cli)
 
     if module.check_mode:
         vc.finish_module(module, changed=changed, cli_cmds=cli)
@@ -20,10 +20,30 @@ options:
   vlan_id:
     description:
       - ID of the VLAN to manage.
+      - Required unless C(aggregate) is given; mutually exclusive with it.
     type: int
-    required: true
     aliases: [id]
 
+  aggregate:
+    description:
+      - List of VLANs to manage in a single device session.
+      - Options not set on an entry fall back to the top-level value.
+    type: list
+    elements: dict
+    suboptions:
+      vlan_id:
+        description: ID of the VLAN to manage.
+        type: int
+        required: true
+        aliases: [id]
+      name:
+        description: Optional VLAN name (only applied when C(state=present)).
+        type: str
+      state:
+        description: Whether the VLAN should be present or absent.
+        type: str
+        choices: [present, absent]
+
   name:
     description:
       - Optional VLAN name (only applied when C(state=present)).
@@ -48,6 +68,7 @@ notes:
   - Requires connection C(ansible_connection=ansible.netcommon.network_cli).
   - Automatically enters and exits system-view mode when changes are needed.
   - For state C(absent), the VLAN is removed via C(undo vlan <id>) without entering the config block.
+  - With C(aggregate), the running configuration is read once and all VLANs are configured in one batch with at most one save.
 
 seealso:
   - module: blumleon.vrp.vrp_interface
@@ -62,6 +83,16 @@ EXAMPLES = r"""
     state: present
     save_when: changed
 
+- name: Create VLANs 200 and 201, delete VLAN 300
+  blumleon.vrp.vrp_vlan:
+    aggregate:
+      - vlan_id: 200
+        name: "SERVERS"
+      - vlan_id: 201
+        name: "CLIENTS"
+      - vlan_id: 300
+        state: absent
+
 - name: Delete VLAN 100
   blumleon.vrp.vrp_vlan:
     vlan_id: 100
@@ -70,7 +101,7 @@ EXAMPLES = r"""
 
 RETURN = r"""
 changed:
-  description: Whether the VLAN was created, renamed, or deleted. Removal reports changed=True even if the VLAN was already absent.
+  description: Whether the VLAN was created, renamed, or deleted.
   type: bool
   returned: always
 
@@ -94,10 +125,58 @@ def _build_body(vlan_id: int, name: str | None) -> list[str]:
     return [f"name {name}"] if name else []
 
 
+def _existing_vlan_ids(running: list[str]) -> set[int]:
+    """
+    IDs of all VLANs in *running*: top-level 'vlan <id>' blocks plus
+    'vlan batch 10 20 to 30' lines (VLANs without any sub-config).
+    """
+    ids: set[int] = set()
+    for line in running:
+        tokens = line.split()
+        if line[:1].isspace() or len(tokens) < 2 or tokens[0] != "vlan":
+            continue
+        if tokens[1] != "batch":
+            if tokens[1].isdigit() and len(tokens) == 2:
+                ids.add(int(tokens[1]))
+            continue
+        nums = tokens[2:]
+        for i, tok in enumerate(nums):
+            if tok == "to" and 0 < i < len(nums) - 1:
+                ids.update(range(int(nums[i - 1]), int(nums[i + 1]) + 1))
+            elif tok.isdigit():
+                ids.add(int(tok))
+    return ids
+
+
+def _vlan_section(
+    v, running: list[str], existing: set[int]
+) -> tuple[list[str], list[str]]:
+    """(parents, body) section that brings VLAN *v* into its desired state."""
+    vid = v["vlan_id"]
+    if v["state"] == "absent":
+        # undo vlan must be issued globally, not inside the VLAN block
+        return [], [f"undo vlan {vid}"] if vid in existing else []
+
+    vlan_parent = f"vlan {vid}"
+
+    body_lines = _build_body(vid, v.get("name"))
+    body = vc.diff_line_match(running, [vlan_parent], body_lines, "replace", [])
+    if not body and vid not in existing:
+        # a VLAN without sub-config is created globally, without entering it
+        return [], [f"vlan batch {vid}"]
+    return [vlan_parent], body
+
+
 def main() -> None:
-    arg_spec = dict(
+    vlan_options = dict(
         vlan_id=dict(type="int", required=True, aliases=["id"]),
         name=dict(type="str"),
+        state=dict(type="str", choices=["present", "absent"]),
+    )
+    arg_spec = dict(
+        vlan_id=dict(type="int", aliases=["id"]),
+        aggregate=dict(type="list", elements="dict", options=vlan_options),
+        name=dict(type="str"),
         state=dict(type="str", choices=["present", "absent"], default="present"),
         save_when=dict(
             type="str",
@@ -105,54 +184,32 @@ def main() -> None:
             default="changed",
         ),
     )
-    module = AnsibleModule(argument_spec=arg_spec, supports_check_mode=True)
+    module = AnsibleModule(
+        argument_spec=arg_spec,
+        mutually_exclusive=[("aggregate", "vlan_id")],
+        required_one_of=[("aggregate", "vlan_id")],
+        supports_check_mode=True,
+    )
     p = module.params
     conn: Connection = Connection(module._socket_path)
 
-    vlan_parent = f"vlan {p['vlan_id']}"
-    body_lines = _build_body(p["vlan_id"], p.get("name"))
-
-    # state=absent
-    if p["state"] == "absent":
-        running_cfg = vc.load_running_config(conn)
-        vlan_exists = vlan_parent in running_cfg
-
-        if not vlan_exists:
-            vc.finish_module(module, changed=False, cli_cmds=[], responses=[])
-            return
+    # one running-config fetch shared by all VLANs
+    running_cfg = vc.load_running_config(conn)
+    existing = _existing_vlan_ids(running_cfg)
+    sections = [_vlan_section(v, running_cfg, existing) for v in vc.expand_aggregate(p)]
 
-        # build the command list manually (undo vlan must be issued globally)
-        commands = ["system-view", f"undo vlan {p['vlan_id']}", "return"]
-        vc.append_save(commands, p["save_when"], changed=True)
-
-        if module.check_mode:
-            vc.finish_module(
-                module,
-                changed=True,
-                cli_cmds=commands,
-            )
-            return
-
-        responses = conn.run_commands(commands)
-        vc.finish_module(module, changed=True, cli_cmds=commands, responses=responses)
+    # idempotent re-run: nothing to send, no further device I/O
+    if not any(body for _, body in sections):
+        vc.finish_module(module, changed=False, cli_cmds=[], responses=[])
         return
 
-    # state=present
-    changed, commands = vc.diff_and_wrap(
-        conn,
-        parents=[vlan_parent],
-        cand_children=body_lines,
-        save_when=p["save_when"],
-        state="replace",
-        keep=[],
-    )
-
+    commands = vc.wrap_sections(sections, p["save_when"])
     if module.check_mode:
-        vc.finish_module(module, changed=changed, cli_cmds=commands)
+        vc.finish_module(module, changed=True, cli_cmds=commands)
         return
 
-    responses = conn.run_commands(commands) if changed else []
-    vc.finish_module(module, changed=changed, cli_cmds=commands, responses=responses)
+    responses = conn.run_commands(commands)
+    vc.finish_module(module, changed=True, cli_cmds=commands, responses=responses)
 
 
 if __name__ == "__main__":
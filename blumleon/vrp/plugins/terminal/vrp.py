@@ -17,13 +17,15 @@ from ansible.plugins.terminal import TerminalBase
 
 class TerminalModule(TerminalBase):
     # VRP-Prompts: User-View <Hostname>, System-View [Hostname]
+    # No optional leading group: a literal first character lets the regex
+    # engine skip ahead quickly on large outputs (display current-configuration).
     terminal_stdout_re = [
-        re.compile(br"(?:\r\n)?<[^>\r\n]+>\s?$"),
-        re.compile(br"(?:\r\n)?\[[^\]\r\n]+\]\s?$"),
+        re.compile(br"<[^>\r\n]+>\s?$"),
+        re.compile(br"\[[^\]\r\n]+\]\s?$"),
     ]
 
     # Error messages usually begin with "Error:"
-    terminal_stderr_re = [re.compile(br"(?:\r\n)?Error:")]
+    terminal_stderr_re = [re.compile(br"Error:")]
 
     # (Optional) strip ANSI escape sequences
     ansi_re = [re.compile(br"\x1b\[[0-9;]*[A-Za-z]")]